@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 from pathlib import Path
 
 # ── 1. CONFIG ──────────────────────────────────────────────────────────────────
@@ -19,37 +20,83 @@ plt.rcParams.update({
     "axes.titlesize": TITLE_SIZE,
     "legend.fontsize": LEGEND_SIZE,
 })
-
-def _style_plotly(fig):
-    """Apply consistent font sizes to Plotly figures."""
-    fig.update_layout(
-        title_font_size=TITLE_SIZE,
-        legend_font_size=LEGEND_SIZE,
-        xaxis_title_font_size=LABEL_SIZE,
-        yaxis_title_font_size=LABEL_SIZE,
-        margin=dict(l=40, r=20, t=60, b=40),
-        legend=dict(title=None),
-    )
-    return fig
+HEATMAP_ANNOT_MAX = 100                  # annotate heatmap cells up to this many
+CACHE_MAX_ENTRIES = 32                   # per-selection cache entries kept per helper
+
+# Shared Plotly styling – applied by the template, not per figure
+pio.templates["phonepe"] = go.layout.Template(layout=dict(
+    title=dict(font=dict(size=TITLE_SIZE)),
+    legend=dict(font=dict(size=LEGEND_SIZE)),
+    xaxis=dict(title=dict(font=dict(size=LABEL_SIZE))),
+    yaxis=dict(title=dict(font=dict(size=LABEL_SIZE))),
+    margin=dict(l=40, r=20, t=60, b=40),
+))
+pio.templates.default = "plotly+phonepe"
+# px writes the legend title itself, so name it here instead of hiding it
+LEGEND_LABELS = {"state_name": "State", "category_name": "Category"}
+px.defaults.labels = LEGEND_LABELS
 
 # ── 2. DATA LOAD ───────────────────────────────────────────────────────────────
 data_dir = Path(__file__).parent      # Change if CSVs are elsewhere
-df1 = pd.read_csv(data_dir / "Decoding Transaction Dynamics on PhonePe.csv")       # state/year totals
-df2 = pd.read_csv(data_dir / "Device Dominance and User Engagement Analysis.csv")  # device stats
-df3 = pd.read_csv(data_dir / "Insurance Penetration and Growth Potential Analysis.csv")
-df4 = pd.read_csv(data_dir / "Transaction Analysis for Market Expansion.csv")      # growth
-df5 = pd.read_csv(data_dir / "User Engagement and Growth Strategy.csv")            # app‑opens
-df_cat = pd.read_csv(data_dir / "agg_Trans.csv")                                   # category trends
 
-# ── 3. SIDEBAR FILTERS ──────────────────────────────────────────────────────────
-# Clean and combine state names from multiple dataframes
-all_states = sorted(
-    set(df1['state_name'].dropna().astype(str).unique()) |
-    set(df3['state_name'].dropna().astype(str).unique()) |
-    set(df4['state_name'].dropna().astype(str).unique()) |
-    set(df5['state_name'].dropna().astype(str).unique())
-)
+def _read(path, **kwargs):
+    """Read the Parquet copy of a CSV when present (see convert_to_parquet.py)."""
+    pq = path.with_suffix(".parquet")
+    if pq.exists():
+        # NumPy dtypes, same as the CSV path: Arrow-backed columns would reach
+        # Plotly as-is, and e.g. px.scatter(size=...) fails on an empty Arrow max()
+        return pd.read_parquet(pq, engine="pyarrow", columns=kwargs.get("usecols"))
+    return pd.read_csv(path, **kwargs)
+
+def _downcast(df):
+    """Shrink integer columns to the smallest type that holds their values."""
+    for c in df.columns:
+        if pd.api.types.is_integer_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], downcast="integer")
+    return df
+
+@st.cache_data(show_spinner=False, ttl=None)
+def load_all(data_dir):
+    """Read every table once; Streamlit serves later reruns from memory."""
+    data_dir = Path(data_dir)
+    df1 = _read(data_dir / "Decoding Transaction Dynamics on PhonePe.csv")       # state/year totals
+    df2 = _read(data_dir / "Device Dominance and User Engagement Analysis.csv")  # device stats
+    df3 = _read(data_dir / "Insurance Penetration and Growth Potential Analysis.csv")
+    df4 = _read(data_dir / "Transaction Analysis for Market Expansion.csv")      # growth
+    df5 = _read(data_dir / "User Engagement and Growth Strategy.csv")            # app‑opens
+    df_cat = _read(data_dir / "agg_Trans.csv",                                   # category trends
+                   usecols=["category_name", "year", "amount"],
+                   dtype={"category_name": "category"})
+    df_cat["category_name"] = df_cat["category_name"].astype("category")
+    for d in (df1, df2, df3, df4, df5, df_cat):
+        _downcast(d)
+
+    # Device stats are static – sort and tier them once here
+    df2_sorted = df2.sort_values("total_registered_users", ascending=False,
+                                 ignore_index=True)
+    # right=True keeps pd.cut's (lo, hi] bins: ≤.1 Low, ≤.2 Medium, else High
+    tier = np.digitize(df2["avg_percentage_usage"].to_numpy(), [.1, .2], right=True)
+    df2_sb = df2.assign(usage_tier=np.array(["Low", "Medium", "High"])[tier])
+
+    # One factorization per frame (NaN is never a category); the union then
+    # only walks the per-frame categories
+    state_frames = (df1, df3, df4, df5)
+    for d in state_frames:
+        d["state_name"] = d["state_name"].astype("category")
+    all_states = sorted(set().union(*(map(str, d["state_name"].cat.categories)
+                                      for d in state_frames)))
+
+    # Shared categories → state codes line up across frames, filtering works
+    # on ints; set_categories remaps the existing codes, no string re-hashing
+    for d in state_frames:
+        d["state_name"] = d["state_name"].cat.set_categories(all_states)
+    return df1, df2, df2_sorted, df2_sb, df3, df4, df5, df_cat, all_states
+
+# Path is passed as str so the cache key hashes cheaply
+(df1, df2, df2_sorted, df2_sb, df3, df4, df5,
+ df_cat, all_states) = load_all(str(data_dir))
 
+# ── 3. SIDEBAR FILTERS ──────────────────────────────────────────────────────────
 # Sidebar multiselect filter for states
 selected_states = st.sidebar.multiselect(
     "Filter by State(s)", all_states, default=all_states
@@ -61,221 +108,316 @@ selected_cats = st.sidebar.multiselect(
     "Filter by Category(s)", all_categories, default=all_categories
 )
 
-# Filter helper
-def _f(df, col="state_name"):
-    return df[df[col].isin(selected_states)] if col in df.columns else df
+# Filter helpers – match on category codes rather than strings
+states_key = tuple(sorted(selected_states))   # hashable cache key
+
+def _by_states(df, states, col="state_name"):
+    if len(states) == len(all_states):   # default selection – nothing to mask
+        return df
+    codes = df[col].cat.categories.get_indexer(states)
+    out = df[df[col].cat.codes.isin(codes)]
+    # Drop filtered-out states so legends/axes only list what is shown
+    return out.assign(**{col: out[col].cat.remove_unused_categories()})
+
+cats_key = tuple(sorted(selected_cats))
+
+def _mean_by(df, x, y, hue):
+    """Mean of y per (x, hue) – same estimator sns.lineplot used."""
+    return df.groupby([x, hue], observed=True)[y].mean().reset_index()
+
+# Cached aggregations – only recomputed when the state selection changes
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def tx_aggs(states_key):
+    """All four Transactions-tab tables from a single filter of df1."""
+    sub = _by_states(df1, states_key)
+    yearly = _mean_by(sub, "year", "total_amount", "state_name")
+    quarterly_ct = _mean_by(sub, "quarter", "total_transactions", "state_name")
+    heat = sub.pivot_table(index="state_name", columns="quarter",
+                           values="total_transactions", aggfunc="sum", observed=True)
+    stacked = sub.groupby(["quarter", "state_name"], observed=True)["total_amount"]\
+                 .sum().unstack(fill_value=0)
+    return yearly, quarterly_ct, heat, stacked
+
+# Cached Plotly figures – rebuilt only when their filter key changes
+def _line(data, x, y, hue, xlabel, ylabel, markers=True):
+    fig = px.line(data, x=x, y=y, color=hue, markers=markers,
+                  labels={**LEGEND_LABELS, x: xlabel, y: ylabel})
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_yearly_amount(states_key):
+    yearly = tx_aggs(states_key)[0]
+    return _line(yearly, "year", "total_amount",
+                 "state_name", "Year", "Total Amount (₹)")
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_quarterly_count(states_key):
+    quarterly_ct = tx_aggs(states_key)[1]
+    return _line(quarterly_ct, "quarter", "total_transactions",
+                 "state_name", "Quarter", "Total Transactions", markers=False)
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_tx_heatmap(states_key):
+    pivot = tx_aggs(states_key)[2]
+    fig = px.imshow(pivot, color_continuous_scale="Blues", aspect="auto",
+                    text_auto=".2s" if pivot.size <= HEATMAP_ANNOT_MAX else False,
+                    labels={"x": "Quarter", "y": "State", "color": "Transactions"})
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_category_trend(cats_key):
+    if len(cats_key) == len(all_categories):
+        sub = df_cat
+    else:
+        sub = df_cat[df_cat.category_name.isin(cats_key)]
+    data = _mean_by(sub, "year", "amount", "category_name")
+    return _line(data, "year", "amount", "category_name",
+                 "Year", "Transaction Amount (₹)")
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_brand_users():
+    fig = px.bar(df2_sorted, x="brand", y="total_registered_users",
+                 color_discrete_sequence=["mediumslateblue"],
+                 labels={"brand": "Brand", "total_registered_users": "Users"})
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_brand_usage():
+    fig = px.bar(df2, x="brand", y="avg_percentage_usage",
+                 color="avg_percentage_usage", color_continuous_scale="RdBu_r",
+                 labels={"brand": "Brand", "avg_percentage_usage": "Usage %"})
+    fig.update_coloraxes(showscale=False)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_usage_sunburst():
+    fig = px.sunburst(df2_sb, path=["usage_tier", "brand"],
+                      values="total_registered_users",
+                      title="Usage Tier and Device Brand Distribution")
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_policies_yearly(states_key):
+    data = _mean_by(_by_states(df3, states_key), "year", "total_policies_sold", "state_name")
+    return _line(data, "year", "total_policies_sold", "state_name", "Year", "Policies Sold")
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_insurance_value(states_key):
+    data = _mean_by(_by_states(df3, states_key), "year", "total_value", "state_name")
+    return _line(data, "year", "total_value", "state_name", "Year", "Value (₹)")
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_policies_quarterly(states_key):
+    data = _mean_by(_by_states(df3, states_key), "quarter", "total_policies_sold", "state_name")
+    return _line(data, "quarter", "total_policies_sold", "state_name", "Quarter", "Policies Sold")
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def insurance_area_pivot(states_key):
+    """Value per (year, quarter) × state; pivot sorts the numeric index."""
+    df_area = _by_states(df3, states_key)
+    pivot_val = df_area.pivot(index=["year", "quarter"], columns="state_name",
+                              values="total_value")
+    # Label only the handful of unique periods, not every row
+    pivot_val.index = pd.Index([f"{y}-Q{q}" for y, q in pivot_val.index], name="time")
+    pivot_val.columns = pivot_val.columns.astype(str)
+    return pivot_val
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_insurance_area(states_key):
+    pivot_val = insurance_area_pivot(states_key)
+    fig = px.area(pivot_val, color_discrete_sequence=px.colors.colorbrewer.Accent,
+                  labels={**LEGEND_LABELS, "time": "Year–Quarter",
+                          "value": "Total Value (₹)"})
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_policies_bar(states_key):
+    fig = px.bar(_by_states(df3, states_key), x="quarter", y="total_policies_sold",
+                 color="state_name", text="total_policies_sold",
+                 barmode="group", title="Insurance Policies Sold per Quarter")
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_growth_percent(states_key):
+    data = _by_states(df4, states_key)\
+               .groupby("state_name", observed=True)["growth_percent"].mean()\
+               .sort_values(ascending=False).reset_index()
+    fig = px.bar(data, x="growth_percent", y="state_name", orientation="h",
+                 color="growth_percent", color_continuous_scale="Viridis_r",
+                 labels={"growth_percent": "Growth (%)", "state_name": "State"})
+    fig.update_coloraxes(showscale=False)
+    fig.update_layout(yaxis=dict(autorange="reversed"))
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_growth_bubble(states_key):
+    fig = px.scatter(_by_states(df4, states_key), x="previous_tx", y="growth",
+                     size="current_tx", color="state_name",
+                     hover_name="state_name", size_max=60,
+                     title="Transaction Growth vs Previous Transactions")
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_engagement_scatter(states_key):
+    # WebGL points, labels passed as one text column
+    fig = px.scatter(_by_states(df5, states_key), x="total_registered_users",
+                     y="total_app_opens", size="total_registered_users",
+                     color="state_name", text="state_name",
+                     render_mode="webgl", size_max=60,
+                     labels={**LEGEND_LABELS,
+                             "total_registered_users": "Registered Users",
+                             "total_app_opens": "App Opens"})
+    fig.update_traces(textposition="top center",
+                      textfont_size=LEGEND_SIZE - 2)
+    fig.update_layout(showlegend=False)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def fig_engagement_bubble(states_key):
+    fig = px.scatter(_by_states(df5, states_key), x="total_registered_users",
+                     y="total_app_opens", size="total_registered_users",
+                     color="state_name", hover_name="state_name",
+                     render_mode="webgl", size_max=60,
+                     title="User Base vs App Opens by State")
+    return fig
+
+# matplotlib figures – built per rerun from cached data (Agg is not
+# thread-safe, so a Figure is never shared between sessions) and closed
+# after st.pyplot so pyplot's figure manager does not accumulate them
+def fig_tx_stacked(states_key):
+    df_stacked = tx_aggs(states_key)[3]
+    fig, ax = plt.subplots(figsize=(10, 5))
+    df_stacked.plot(kind="bar", stacked=True, ax=ax)
+    ax.set_xlabel("Quarter"); ax.set_ylabel("Transaction Amount (₹)")
+    ax.legend(title="State", bbox_to_anchor=(1.02, 1), loc="upper left")
+    return fig
 
-df1_f, df3_f, df4_f, df5_f = map(_f, [df1, df3, df4, df5])
-df_cat_f = df_cat[df_cat.category_name.isin(selected_cats)]
+def fig_brand_pie():
+    sizes = df2["total_registered_users"]; labels = df2["brand"]
+    fig, ax = plt.subplots(figsize=(6, 6))
+    wedges, _, _ = ax.pie(sizes, autopct="%1.1f%%", startangle=140,
+                          pctdistance=0.75, textprops={"fontsize": LEGEND_SIZE})
+    ax.legend(wedges, labels, title="Brands",
+              loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+    ax.axis("equal")
+    return fig
 
 # ── 4. LAYOUT – TABS ───────────────────────────────────────────────────────────
-tabs = st.tabs([
+tabs = [
     "📈 Transactions", "📂 Categories", "📱 Devices",
     "🛡 Insurance", "🚀 Growth", "👥 Engagement"
-])
+]
+# st.tabs runs every tab body on each rerun; a radio in session_state
+# lets only the visible section build (or fetch) its figures
+active_tab = st.radio("Section", tabs, horizontal=True,
+                      key="active_tab", label_visibility="collapsed")
 
 # ————————————————————————————————————————————————————————————————
-with tabs[0]:
+if active_tab == tabs[0]:
     st.header("Transactions")
     col1, col2 = st.columns(2)
     
     # 4.1 Yearly total transaction amount
     with col1:
         st.subheader("Total Transaction Amount by State (Yearly)")
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sns.lineplot(data=df1_f, x="year", y="total_amount",
-                     hue="state_name", marker="o", ax=ax)
-        ax.set_ylabel("Total Amount (₹)")
-        ax.set_xlabel("Year")
-        ax.legend(title="State", bbox_to_anchor=(1.02, 1), loc="upper left")
-        st.pyplot(fig)
+        st.plotly_chart(fig_yearly_amount(states_key), use_container_width=True)
 
     # 4.2 Quarterly total_transactions
     with col2:
         st.subheader("Quarterly Transaction Count by State")
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sns.lineplot(data=df1_f, x="quarter", y="total_transactions",
-                     hue="state_name", ax=ax)
-        ax.set_ylabel("Total Transactions")
-        ax.set_xlabel("Quarter")
-        ax.legend(title="State", bbox_to_anchor=(1.02, 1), loc="upper left")
-        st.pyplot(fig)
+        st.plotly_chart(fig_quarterly_count(states_key), use_container_width=True)
 
     # 4.3 Heatmap
     st.subheader("Heatmap – Transactions per Quarter & State")
-    pivot = df1_f.pivot_table(index="state_name", columns="quarter",
-                              values="total_transactions", aggfunc="sum")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(pivot, cmap="Blues", annot=True, fmt=".0f",
-                annot_kws={"size": LEGEND_SIZE}, linewidths=.4, ax=ax)
-    ax.set_xlabel("Quarter"); ax.set_ylabel("State")
-    st.pyplot(fig)
+    st.plotly_chart(fig_tx_heatmap(states_key), use_container_width=True)
 
     # 4.4 Stacked bar – total amount per quarter
     st.subheader("Stacked Bar – Transaction Amount per Quarter")
-    fig = plt.figure(figsize=(10, 5))
-    df_stacked = df1_f.groupby(["quarter", "state_name"])["total_amount"]\
-                      .sum().unstack(fill_value=0)
-    df_stacked.plot(kind="bar", stacked=True, ax=plt.gca())
-    plt.xlabel("Quarter"); plt.ylabel("Transaction Amount (₹)")
-    plt.legend(title="State", bbox_to_anchor=(1.02, 1), loc="upper left")
+    fig = fig_tx_stacked(states_key)
     st.pyplot(fig)
+    plt.close(fig)
 
 # ————————————————————————————————————————————————————————————————
-with tabs[1]:
+if active_tab == tabs[1]:
     st.header("Category Trends")
     st.subheader("Transaction Amount Trend by Category")
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.lineplot(data=df_cat_f, x="year", y="amount",
-                 hue="category_name", marker="o", ax=ax)
-    ax.set_xlabel("Year"); ax.set_ylabel("Transaction Amount (₹)")
-    ax.legend(bbox_to_anchor=(1.02, 1), loc="upper left", title="Category")
-    st.pyplot(fig)
+    st.plotly_chart(fig_category_trend(cats_key), use_container_width=True)
 
 # ————————————————————————————————————————————————————————————————
-with tabs[2]:
+if active_tab == tabs[2]:
     st.header("Device Metrics")
 
     c1, c2 = st.columns(2)
     # 2.1 Total registered users bar
     with c1:
         st.subheader("Total Registered Users by Brand")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        df2.sort_values("total_registered_users", ascending=False).plot(
-            x="brand", y="total_registered_users", kind="bar",
-            color="mediumslateblue", ax=ax, legend=False)
-        ax.set_xlabel("Brand"); ax.set_ylabel("Users")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+        st.plotly_chart(fig_brand_users(), use_container_width=True)
 
     # 2.2 Average usage bar
     with c2:
         st.subheader("Average Usage Percentage by Brand")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.barplot(data=df2, x="brand", y="avg_percentage_usage",
-                    palette="coolwarm", ax=ax)
-        ax.set_xlabel("Brand"); ax.set_ylabel("Usage %")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+        st.plotly_chart(fig_brand_usage(), use_container_width=True)
 
     # 2.3 Pie share
     st.subheader("Share of Registered Users (Pie)")
-    sizes = df2["total_registered_users"]; labels = df2["brand"]
-    fig, ax = plt.subplots(figsize=(6, 6))
-    wedges, _, _ = ax.pie(sizes, autopct="%1.1f%%", startangle=140,
-                          pctdistance=0.75, textprops={"fontsize": LEGEND_SIZE})
-    ax.legend(wedges, labels, title="Brands",
-              loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-    ax.axis("equal")
+    fig = fig_brand_pie()
     st.pyplot(fig)
+    plt.close(fig)
 
     # 2.4 Sunburst (plotly)
     st.subheader("Usage Tier & Device Brand Distribution (Sunburst)")
-    df2_sb = df2.copy()
-    df2_sb["usage_tier"] = pd.cut(df2_sb["avg_percentage_usage"],
-                                  bins=[0, .1, .2, .3],
-                                  labels=["Low", "Medium", "High"]).astype(str)
-    fig = px.sunburst(df2_sb, path=["usage_tier", "brand"],
-                      values="total_registered_users",
-                      title="Usage Tier and Device Brand Distribution")
-    st.plotly_chart(_style_plotly(fig), use_container_width=True)
+    st.plotly_chart(fig_usage_sunburst(), use_container_width=True)
 
 # ————————————————————————————————————————————————————————————————
-with tabs[3]:
+if active_tab == tabs[3]:
     st.header("Insurance")
 
     col1, col2 = st.columns(2)
     # 3.1 Policies sold over time
     with col1:
         st.subheader("Policies Sold – Yearly")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.lineplot(data=df3_f, x="year", y="total_policies_sold",
-                     hue="state_name", marker="o", ax=ax)
-        ax.set_xlabel("Year"); ax.set_ylabel("Policies Sold")
-        ax.legend(bbox_to_anchor=(1.02, 1), loc="upper left", title="State")
-        st.pyplot(fig)
+        st.plotly_chart(fig_policies_yearly(states_key), use_container_width=True)
 
     # 3.2 Insurance value yearly
     with col2:
         st.subheader("Total Insurance Value – Yearly")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.lineplot(data=df3_f, x="year", y="total_value",
-                     hue="state_name", marker="o", ax=ax)
-        ax.set_xlabel("Year"); ax.set_ylabel("Value (₹)")
-        ax.legend(bbox_to_anchor=(1.02, 1), loc="upper left", title="State")
-        st.pyplot(fig)
+        st.plotly_chart(fig_insurance_value(states_key), use_container_width=True)
 
     # 3.3 Policies sold quarterly
     st.subheader("Policies Sold – Quarterly")
-    fig, ax = plt.subplots(figsize=(10, 4))
-    sns.lineplot(data=df3_f, x="quarter", y="total_policies_sold",
-                 hue="state_name", marker="o", ax=ax)
-    ax.set_xlabel("Quarter"); ax.set_ylabel("Policies Sold")
-    ax.legend(bbox_to_anchor=(1.02, 1), loc="upper left", title="State")
-    st.pyplot(fig)
+    st.plotly_chart(fig_policies_quarterly(states_key), use_container_width=True)
 
     # 3.4 Area chart insurance value growth
     st.subheader("Cumulative Insurance Value Growth (Area)")
-    df_area = df3_f.copy()
-    df_area["time"] = df_area["year"].astype(str) + "-Q" + df_area["quarter"].astype(str)
-    df_area = df_area.sort_values(["state_name", "year", "quarter"])
-    pivot_val = df_area.pivot(index="time", columns="state_name", values="total_value")
-    fig = plt.figure(figsize=(10, 5))
-    pivot_val.plot(kind="area", stacked=True, ax=plt.gca(), colormap="Accent")
-    plt.xlabel("Year–Quarter"); plt.ylabel("Total Value (₹)")
-    plt.legend(bbox_to_anchor=(1.02, 1), loc="upper left", title="State")
-    st.pyplot(fig)
+    st.plotly_chart(fig_insurance_area(states_key), use_container_width=True)
 
     # 3.5 Plotly bar – policies per quarter
     st.subheader("Policies per Quarter (Plotly)")
-    fig = px.bar(df3_f, x="quarter", y="total_policies_sold",
-                 color="state_name", text="total_policies_sold",
-                 barmode="group", title="Insurance Policies Sold per Quarter")
-    st.plotly_chart(_style_plotly(fig), use_container_width=True)
+    st.plotly_chart(fig_policies_bar(states_key), use_container_width=True)
 
 # ————————————————————————————————————————————————————————————————
-with tabs[4]:
+if active_tab == tabs[4]:
     st.header("Transaction Growth")
 
     # 4.1 Growth percent bar
     st.subheader("Growth Percentage by State")
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.barplot(data=df4_f.sort_values("growth_percent", ascending=False),
-                x="growth_percent", y="state_name", palette="viridis", ax=ax)
-    ax.set_xlabel("Growth (%)"); ax.set_ylabel("State")
-    st.pyplot(fig)
+    st.plotly_chart(fig_growth_percent(states_key), use_container_width=True)
 
     # 4.2 Bubble scatter – growth vs previous
     st.subheader("Growth vs Previous Transactions (Bubble)")
-    fig = px.scatter(df4_f, x="previous_tx", y="growth",
-                     size="current_tx", color="state_name",
-                     hover_name="state_name", size_max=60,
-                     title="Transaction Growth vs Previous Transactions")
-    st.plotly_chart(_style_plotly(fig), use_container_width=True)
+    st.plotly_chart(fig_growth_bubble(states_key), use_container_width=True)
 
 # ————————————————————————————————————————————————————————————————
-with tabs[5]:
+if active_tab == tabs[5]:
     st.header("User Engagement")
 
     # 5.1 Scatter – app opens vs users
     st.subheader("Registered Users vs App Opens")
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.scatterplot(data=df5_f, x="total_registered_users",
-                    y="total_app_opens", hue="state_name",
-                    size="total_registered_users", ax=ax, legend=False)
-    ax.set_xlabel("Registered Users"); ax.set_ylabel("App Opens")
-    for _, row in df5_f.iterrows():
-        ax.text(row.total_registered_users, row.total_app_opens,
-                row.state_name, fontsize=LEGEND_SIZE - 2)
-    st.pyplot(fig)
+    st.plotly_chart(fig_engagement_scatter(states_key), use_container_width=True)
 
     # 5.2 Plotly scatter – bubble
     st.subheader("Bubble – User Base vs App Opens")
-    fig = px.scatter(df5_f, x="total_registered_users",
-                     y="total_app_opens", size="total_registered_users",
-                     color="state_name", hover_name="state_name",
-                     size_max=60, title="User Base vs App Opens by State")
-    st.plotly_chart(_style_plotly(fig), use_container_width=True)
+    st.plotly_chart(fig_engagement_bubble(states_key), use_container_width=True)
 
 # ── 5. FOOTER ─────────────────────────────────────────────────────────────────
 st.success("✅ Dashboard loaded successfully!")
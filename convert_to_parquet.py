@@ -0,0 +1,24 @@
+import pandas as pd
+from pathlib import Path
+
+# One-shot conversion of the dashboard CSVs to Parquet.
+# Run once (python convert_to_parquet.py); Dashboard.py picks up the
+# .parquet files automatically and falls back to the CSVs when absent.
+data_dir = Path(__file__).parent      # Change if CSVs are elsewhere
+CSV_FILES = [
+    "Decoding Transaction Dynamics on PhonePe.csv",
+    "Device Dominance and User Engagement Analysis.csv",
+    "Insurance Penetration and Growth Potential Analysis.csv",
+    "Transaction Analysis for Market Expansion.csv",
+    "User Engagement and Growth Strategy.csv",
+    "agg_Trans.csv",
+]
+
+for name in CSV_FILES:
+    src = data_dir / name
+    if not src.exists():
+        print(f"skip  {name} (not found)")
+        continue
+    dst = src.with_suffix(".parquet")
+    pd.read_csv(src).to_parquet(dst, engine="pyarrow", index=False)
+    print(f"wrote {dst.name}")